@@ -1,8 +1,12 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend: figures are written to PNG files
 import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
+from functools import lru_cache
+import os
 import warnings
 
 # Suppress minor warnings for clean output
@@ -14,27 +18,87 @@ FILE_PATH = 'Netflix Dataset.csv'
 NETFLIX_RED = '#E50914'
 LIGHT_GREY = '#6e7072'
 
-def load_and_preprocess_data(file_path):
-    """Loads the dataset and performs cleaning, date conversion, and preparation."""
-    print("--- 1. Data Loading and Preprocessing ---")
-    try:
-        df = pd.read_csv(file_path)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}. Please check the file name and path.")
-        return None
+# Only the columns consumed by the objectives are loaded, with predeclared dtypes
+USECOLS = ['Category', 'Country', 'Release_Date', 'Type']
+DTYPES = {'Category': 'category', 'Country': 'string', 'Release_Date': 'string', 'Type': 'string'}
+# Bump whenever preprocessing changes so stale Parquet caches are not reused
+CACHE_VERSION = 1
+
+@lru_cache(maxsize=None)
+def get_palette(name, n_colors):
+    """Returns a seaborn palette, generating each (name, size) combination only once."""
+    return sns.color_palette(name, n_colors=n_colors)
+
+def save_figure(fig, file_name):
+    """Writes a figure to PNG, trimming margins during the render itself, and closes it."""
+    fig.savefig(file_name, bbox_inches='tight', dpi=120, pil_kwargs={'optimize': True, 'compress_level': 6})
+    plt.close(fig)
 
+def preprocess_data(df):
+    """Cleans the raw rows: renames columns, derives the year, and fills gaps."""
     # Rename column for easier access
-    df.rename(columns={'Category': 'Content_Type', 'Type': 'Genre'}, inplace=True)
+    df = df.rename(columns={'Category': 'Content_Type', 'Type': 'Genre'})
 
-    # Convert Release_Date to datetime, then extract Release_Year
-    df['Release_Date'] = pd.to_datetime(df['Release_Date'])
-    df['Release_Year'] = df['Release_Date'].dt.year
+    # Only the year is used downstream, so take the trailing 4 digits of e.g. "September 9, 2019"
+    # rather than parsing full datetimes (nullable for missing/malformed dates)
+    df['Release_Year'] = df['Release_Date'].str.extract(r'(\d{4})\s*$', expand=False).astype('Int16')
+    # The full date isn't used past this point; don't carry it into the frame or cache
+    df = df.drop(columns=['Release_Date'])
 
     # Handling missing 'Country' data: impute with 'Unknown' or mode, but for country analysis, we drop NA for accuracy.
     # For simplicity, we fill NA in Country and Genre with 'Missing' to keep all rows for general stats,
     # but we'll drop them for specific Objective 3 analysis.
-    df['Country'].fillna('Missing', inplace=True)
-    df['Genre'].fillna('Missing', inplace=True)
+    df = df.fillna({'Country': 'Missing', 'Genre': 'Missing'})
+    return df
+
+def cache_path_for(file_path):
+    """Returns the Parquet cache location that sits alongside the source CSV."""
+    return f"{os.path.splitext(file_path)[0]}.v{CACHE_VERSION}.parquet"
+
+def load_and_preprocess_data(file_path):
+    """Loads the dataset and performs cleaning, year extraction, and preparation.
+
+    The preprocessed frame is cached as Parquet next to the CSV and reused on later
+    runs for as long as the cache is newer than the CSV and matches CACHE_VERSION.
+    Caching is best-effort: any failure to read or write it falls back to the CSV.
+    """
+    print("--- 1. Data Loading and Preprocessing ---")
+    cache_path = cache_path_for(file_path)
+    df = None
+    if (os.path.exists(file_path) and os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(file_path)):
+        try:
+            df = pd.read_parquet(cache_path)
+            print(f"Loaded preprocessed data from cache {cache_path}.")
+        except (ImportError, OSError, ValueError, NotImplementedError) as e:
+            print(f"Note: ignoring unreadable cache {cache_path} ({e}).")
+
+    if df is None:
+        try:
+            df = pd.read_csv(
+                file_path,
+                usecols=USECOLS,
+                dtype=DTYPES,
+                engine='c'
+            )
+        except FileNotFoundError:
+            print(f"Error: File not found at {file_path}. Please check the file name and path.")
+            return None
+
+        df = preprocess_data(df)
+
+        # Parquet keeps the category/nullable dtypes, so a cached reload needs no preprocessing
+        # (Parquet engines report I/O and codec problems as OSError, ValueError or NotImplementedError subclasses)
+        try:
+            df.to_parquet(cache_path, compression='zstd', index=False)
+        except (ImportError, OSError, ValueError, NotImplementedError) as e:
+            print(f"Note: could not write cache {cache_path} ({e}); continuing without it.")
+            # Don't leave a partially written file to be picked up next run
+            if os.path.exists(cache_path):
+                try:
+                    os.remove(cache_path)
+                except OSError:
+                    pass
     
     print(f"Dataset loaded with {len(df)} records.")
     print(f"Earliest Release Year: {df['Release_Year'].min()}, Latest Release Year: {df['Release_Year'].max()}")
@@ -42,72 +106,97 @@ def load_and_preprocess_data(file_path):
 
 def explode_data_for_counting(df, column):
     """Splits and 'explodes' a column with comma-separated values for accurate counting."""
-    # Create a copy to avoid SettingWithCopyWarning
-    df_temp = df.copy()
-    
-    # Drop rows where the column is 'Missing' or blank, as they won't contribute to trends
-    if column in ['Country', 'Genre']:
-        df_temp = df_temp[df_temp[column] != 'Missing']
+    # Drop rows where the column is 'Missing' or blank, as they won't contribute to trends.
+    # Only the two columns used here are selected, which already yields a new frame.
+    mask = df[column] != 'Missing' if column in ['Country', 'Genre'] else slice(None)
+    df_temp = df.loc[mask, ['Release_Year', column]]
         
-    # Split and clean entries
-    exploded_df = df_temp.assign(
-        Split_Value=df_temp[column].str.split(', ')
-    ).explode('Split_Value')
+    # Split every cell once into its stripped, non-empty entries (e.g. "Dramas," yields
+    # just "Dramas"), then flatten them and repeat each row's year by its entry count
+    split_cells = [[t for t in map(str.strip, s.split(',')) if t] for s in df_temp[column].to_numpy()]
+    lengths = np.fromiter(map(len, split_cells), dtype=np.int64, count=len(split_cells))
     
-    # Clean up whitespace and ensure titles are capitalized for consistency
-    exploded_df['Split_Value'] = exploded_df['Split_Value'].str.strip()
+    exploded_df = pd.DataFrame({
+        'Split_Value': [t for tokens in split_cells for t in tokens],
+        'Release_Year': df_temp['Release_Year'].array.repeat(lengths)
+    })
     
     return exploded_df
 
+def count_split_values(series):
+    """Tallies individual entries of a comma-separated column without building an exploded frame.
+
+    Returns parallel (labels, counts) arrays, with labels in sorted order.
+    """
+    cells = series.dropna().to_numpy()
+    # 'Missing' placeholders don't contribute to trends
+    cells = cells[cells != 'Missing']
+    counts = Counter(t for s in cells for t in map(str.strip, s.split(',')) if t)
+    labels = sorted(counts)
+    return np.array(labels, dtype=object), np.fromiter((counts[l] for l in labels), dtype=np.int64, count=len(labels))
+
+def top_counts(labels, counts, top_n):
+    """Returns the top_n largest counts as a Series, ordered from largest to smallest.
+
+    Labels arrive sorted, so the stable sort breaks ties alphabetically.
+    """
+    order = np.argsort(-counts, kind='stable')[:top_n]
+    return pd.Series(counts[order], index=labels[order])
+
 def objective_1_content_type_evolution(df):
     """Analyzes the distribution of Movies vs. TV Shows over the years (Objective 1)."""
     print("\n--- 2. Objective 1: Movies vs. TV Shows Content Evolution ---")
     
     # Count content type additions per year
-    content_by_year = df.groupby(['Release_Year', 'Content_Type']).size().unstack(fill_value=0)
+    content_by_year = df.groupby(['Release_Year', 'Content_Type'], observed=True).size().unstack(fill_value=0)
     
     # Filter for the main trend period (e.g., last 10 years, or from 2014 onwards)
     start_year = content_by_year.index.max() - 10 if content_by_year.index.max() > 2014 else content_by_year.index.min()
     content_by_year_filtered = content_by_year[content_by_year.index >= start_year]
     
     # Visualization: Dual Line Chart
-    plt.figure(figsize=(12, 6))
-    
-    sns.lineplot(
-        x=content_by_year_filtered.index, 
-        y=content_by_year_filtered['Movie'], 
-        label='Movies Added', 
-        color='blue', 
-        linewidth=2, 
-        marker='o'
-    )
+    with plt.rc_context({'figure.max_open_warning': 0}):
+        fig, ax = plt.subplots(figsize=(12, 6))
     
-    sns.lineplot(
-        x=content_by_year_filtered.index, 
-        y=content_by_year_filtered['TV Show'], 
-        label='TV Shows Added', 
-        color=NETFLIX_RED, 
-        linewidth=2, 
-        marker='s'
-    )
+        sns.lineplot(
+            x=content_by_year_filtered.index, 
+            y=content_by_year_filtered['Movie'], 
+            label='Movies Added', 
+            color='blue', 
+            linewidth=2, 
+            marker='o',
+            ax=ax
+        )
+    
+        sns.lineplot(
+            x=content_by_year_filtered.index, 
+            y=content_by_year_filtered['TV Show'], 
+            label='TV Shows Added', 
+            color=NETFLIX_RED, 
+            linewidth=2, 
+            marker='s',
+            ax=ax
+        )
 
-    plt.title(f'Annual Content Additions (Movies vs. TV Shows): {start_year} - {content_by_year.index.max()}', fontsize=16)
-    plt.xlabel('Release Year', fontsize=12)
-    plt.ylabel('Number of Titles Added', fontsize=12)
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.legend(title='Content Type')
-    plt.xticks(content_by_year_filtered.index, rotation=45)
-    plt.tight_layout()
-    plt.show()
+        plt.title(f'Annual Content Additions (Movies vs. TV Shows): {start_year} - {content_by_year.index.max()}', fontsize=16)
+        plt.xlabel('Release Year', fontsize=12)
+        plt.ylabel('Number of Titles Added', fontsize=12)
+        plt.grid(True, linestyle='--', alpha=0.6)
+        plt.legend(title='Content Type')
+        plt.xticks(content_by_year_filtered.index, rotation=45)
+        save_figure(fig, 'objective_1.png')
     
     # Provide a key finding
     peak_movie = content_by_year['Movie'].max()
     peak_tv = content_by_year['TV Show'].max()
     peak_year_movie = content_by_year['Movie'].idxmax()
     peak_year_tv = content_by_year['TV Show'].idxmax()
+    # One pass over the column yields both totals
+    type_counts = df['Content_Type'].value_counts()
+    movie_total, tv_total = type_counts.get('Movie', 0), type_counts.get('TV Show', 0)
 
     print(f"\n--- Key Findings (Content Type) ---")
-    print(f"Overall Catalog Composition: Movie: {len(df[df['Content_Type'] == 'Movie'])}, TV Show: {len(df[df['Content_Type'] == 'TV Show'])}")
+    print(f"Overall Catalog Composition: Movie: {movie_total}, TV Show: {tv_total}")
     print(f"Peak Movie Additions ({peak_movie} titles) occurred in {peak_year_movie}.")
     print(f"Peak TV Show Additions ({peak_tv} titles) occurred in {peak_year_tv}.")
     print("-" * 35)
@@ -120,72 +209,82 @@ def objective_2_genre_popularity(df, top_n=10):
     genres_exploded_df = explode_data_for_counting(df, 'Genre')
     genres_exploded_df.rename(columns={'Split_Value': 'Individual_Genre'}, inplace=True)
     
+    # Genre x year counts are built once in a single crosstab; both the overall and
+    # recent views derive from it. dropna=False keeps titles without a release year
+    # in the overall totals.
+    genre_trends = pd.crosstab(
+        genres_exploded_df['Individual_Genre'],
+        genres_exploded_df['Release_Year'],
+        dropna=False
+    )
+    
     # 1. Overall Top Genres
-    overall_genre_counts = genres_exploded_df['Individual_Genre'].value_counts().nlargest(top_n)
+    overall_genre_counts = genre_trends.sum(axis=1).nlargest(top_n)
     
     print(f"\n--- Overall Top {top_n} Genres (All Time) ---")
     print(overall_genre_counts)
     
     # 2. Genre shift analysis (Focusing on a period, e.g., 2018 onwards as suggested by modern content strategy)
     recent_years = [y for y in range(df['Release_Year'].max() - 3, df['Release_Year'].max() + 1)]
-    recent_genres_df = genres_exploded_df[genres_exploded_df['Release_Year'].isin(recent_years)]
     
-    recent_genre_trends = recent_genres_df.groupby(['Individual_Genre', 'Release_Year']).size().unstack(fill_value=0)
-    
-    # Filter to only the top overall genres for a focused plot
+    # Filter to only the top overall genres (and recent years) for a focused plot
     top_genres_names = overall_genre_counts.index.tolist()
-    recent_genre_trends_focused = recent_genre_trends[recent_genre_trends.index.isin(top_genres_names)]
+    recent_genre_trends_focused = genre_trends.reindex(
+        index=top_genres_names, columns=recent_years, fill_value=0
+    ).astype('int32')
     
     # Sort the focused trends by the latest year's count to prioritize current relevance
-    recent_genre_trends_focused['Total_Recent'] = recent_genre_trends_focused.sum(axis=1)
-    recent_genre_trends_focused = recent_genre_trends_focused.sort_values(by=recent_years[-1], ascending=False).drop(columns=['Total_Recent'])
+    recent_genre_trends_focused = recent_genre_trends_focused.sort_values(by=recent_years[-1], ascending=False)
     
     # Visualization: Stacked Bar Chart for Recent Trend
-    ax = recent_genre_trends_focused.plot(
-        kind='bar', 
-        stacked=True, 
-        figsize=(12, 7), 
-        color=sns.color_palette("Spectral", n_colors=len(recent_years))
-    )
-    plt.title(f'Top {top_n} Genre Popularity Shift ({recent_years[0]} - {recent_years[-1]})', fontsize=16)
-    plt.xlabel('Genre', fontsize=12)
-    plt.ylabel('Number of Titles', fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    plt.legend(title='Release Year', loc='upper right')
-    plt.tight_layout()
-    plt.show()
+    with plt.rc_context({'figure.max_open_warning': 0}):
+        fig, ax = plt.subplots(figsize=(12, 7))
+        x = np.arange(len(recent_genre_trends_focused))
+        bottom = np.zeros(len(x))
+        # Stack one bar series per year, each starting where the previous one ended
+        for year, color in zip(recent_years, get_palette('Spectral', len(recent_years))):
+            values = recent_genre_trends_focused[year].to_numpy()
+            ax.bar(x, values, width=0.5, bottom=bottom, color=color, label=str(year))
+            bottom += values
+        ax.set_xticks(x)
+        ax.set_xticklabels(recent_genre_trends_focused.index, rotation=45, ha='right')
+        plt.title(f'Top {top_n} Genre Popularity Shift ({recent_years[0]} - {recent_years[-1]})', fontsize=16)
+        plt.xlabel('Genre', fontsize=12)
+        plt.ylabel('Number of Titles', fontsize=12)
+        plt.legend(title='Release Year', loc='upper right')
+        save_figure(fig, 'objective_2.png')
 
 def objective_3_country_contribution(df, top_n=10):
     """Compares country-wise contributions to the catalog (Objective 3)."""
     print("\n--- 4. Objective 3: Global Country Contribution ---")
     
-    # Explode the Country column
-    country_exploded_df = explode_data_for_counting(df, 'Country')
-    country_exploded_df.rename(columns={'Split_Value': 'Individual_Country'}, inplace=True)
+    # Tally individual countries (no per-year breakdown is needed here)
+    country_labels, country_counts = count_split_values(df['Country'])
     
     # 1. Overall Top Countries
-    overall_country_counts = country_exploded_df['Individual_Country'].value_counts().nlargest(top_n)
+    overall_country_counts = top_counts(country_labels, country_counts, top_n)
     
     print(f"\n--- Overall Top {top_n} Content-Contributing Countries ---")
     print(overall_country_counts)
     
     # Visualization: Bar Chart
-    plt.figure(figsize=(12, 6))
-    sns.barplot(
-        x=overall_country_counts.index, 
-        y=overall_country_counts.values, 
-        palette=sns.color_palette("viridis", n_colors=top_n)
-    )
+    with plt.rc_context({'figure.max_open_warning': 0}):
+        fig, ax = plt.subplots(figsize=(12, 6))
+        sns.barplot(
+            x=overall_country_counts.index, 
+            y=overall_country_counts.values, 
+            palette=get_palette('viridis', top_n),
+            ax=ax
+        )
     
-    plt.title(f'Top {top_n} Countries by Content Contribution', fontsize=16)
-    plt.xlabel('Country', fontsize=12)
-    plt.ylabel('Total Content Count (Movies & TV Shows)', fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.show()
+        plt.title(f'Top {top_n} Countries by Content Contribution', fontsize=16)
+        plt.xlabel('Country', fontsize=12)
+        plt.ylabel('Total Content Count (Movies & TV Shows)', fontsize=12)
+        plt.xticks(rotation=45, ha='right')
+        save_figure(fig, 'objective_3.png')
     
     # 2. Country contribution ratio (US vs. International)
-    total_content = len(country_exploded_df)
+    total_content = int(country_counts.sum())
     us_count = overall_country_counts.get('United States', 0)
     
     # The 'International' category is implicitly everything else